@@ -20,23 +20,378 @@ logging, authentication, and more advanced use cases.
 print("=== ADVANCED DECORATORS ===")
 
 # Caching decorator
-def cache_result(func):
-    """Decorator to cache function results."""
-    cache = {}
+import pickle
+import sys
+from collections import OrderedDict
+
+def deep_getsizeof(obj):
+    """Estimate the memory held by an object and everything it references."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__"):
+            stack.append(vars(current))
+    return total
+
+class _Tag:
+    """Marker placed in cache keys; it compares equal only to itself."""
+    __slots__ = ("name",)
     
-    def wrapper(*args, **kwargs):
-        # Create cache key from arguments
-        key = str(args) + str(sorted(kwargs.items()))
+    def __init__(self, name):
+        self.name = name
+    
+    def __repr__(self):
+        return f"<{self.name}>"
+
+_KWARGS_MARK = _Tag("kwargs")
+_LIST_TAG = _Tag("list")
+_DICT_TAG = _Tag("dict")
+_SET_TAG = _Tag("set")
+_FAST_KEY_TYPES = {int, str}
+
+def _freeze(value):
+    """Convert unhashable arguments (lists, dicts, sets) into hashable equivalents.
+    
+    Frozen containers carry a type tag, so ``[1, 2]`` and ``(1, 2)`` or
+    ``{"a": 1}`` and ``(("a", 1),)`` never share a key. Anything else
+    that cannot be hashed raises TypeError; the caller then skips the cache.
+    """
+    if isinstance(value, tuple):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, list):
+        return (_LIST_TAG,) + tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return (_DICT_TAG, frozenset((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, set):
+        return (_SET_TAG, frozenset(_freeze(item) for item in value))
+    if isinstance(value, frozenset):
+        return frozenset(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+_SCALAR_KEY_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+def _encode_key(value):
+    """Encode a cache key as bytes that are identical in every process.
+    
+    pickle is not enough: a frozenset of strings iterates in an order that
+    depends on the per-process string hash seed. Here set members are
+    sorted by their encoding, and every part is length-prefixed. Other
+    objects fall back to pickle; a TypeError (or PicklingError) means the
+    key cannot be shared.
+    """
+    if isinstance(value, _Tag):
+        return b"@" + value.name.encode()
+    if type(value) is tuple or type(value) is frozenset:
+        parts = [_encode_key(item) for item in value]
+        if type(value) is frozenset:
+            parts.sort()
+        return (b"T" if type(value) is tuple else b"S") + b"".join(
+            b"%d:%s" % (len(part), part) for part in parts)
+    if type(value) in _SCALAR_KEY_TYPES:
+        return b"%s=%s" % (type(value).__name__.encode(), repr(value).encode())
+    return b"P" + pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+def make_cache_key(args, kwargs):
+    """Build a cache key from call arguments without string formatting.
+
+    The key is a plain tuple; it may still be unhashable, in which case
+    the caller falls back to ``_freeze(key)``, and calls func uncached
+    if even that fails.
+    """
+    if not kwargs and len(args) == 1 and type(args[0]) in _FAST_KEY_TYPES:
+        return args[0]
+    if kwargs:
+        return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    return args
+
+class SQLiteCacheBackend:
+    """On-disk memoization store shared by every process that opens the file.
+
+    Results are pickled into a SQLite table, so they survive restarts and
+    are visible to other worker processes. WAL journaling plus a busy
+    timeout lets concurrent writers queue up instead of failing. Once more
+    than ``max_entries`` rows exist, the least recently read ones are
+    deleted (checked every ``prune_every`` writes to keep writes cheap).
+    """
+    
+    def __init__(self, path, max_entries=100_000, prune_every=64, timeout=30.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self.timeout = timeout
+        self._local = None
+        self._pid = None
+        self._writes = 0
+    
+    def _connection(self):
+        """Per-process, per-thread connection (reopened after fork)."""
+        import os
+        import sqlite3
+        import threading
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._local = threading.local()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS memo ("
+                " key BLOB PRIMARY KEY, value BLOB NOT NULL,"
+                " expires_at REAL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS memo_access ON memo (last_access)")
+            self._local.conn = conn
+        return conn
+    
+    def get(self, key):
+        """Return ``(True, value)`` for a live entry, else ``(False, None)``."""
+        import pickle
+        import time
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires_at, last_access FROM memo WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        value, expires_at, last_access = row
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            conn.execute("DELETE FROM memo WHERE key = ?", (key,))
+            return False, None
+        if now - last_access > 1.0:
+            # Refresh recency at most once a second so hot reads stay read-only
+            conn.execute("UPDATE memo SET last_access = ? WHERE key = ?", (now, key))
+        return True, pickle.loads(value)
+    
+    def set(self, key, value, ttl=None):
+        """Store a result, replacing any previous value for the key."""
+        import pickle
+        import time
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO memo (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires_at, now),
+        )
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+    
+    def prune(self):
+        """Drop expired rows and the least recently read rows above max_entries."""
+        import time
+        conn = self._connection()
+        conn.execute("DELETE FROM memo WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        (count,) = conn.execute("SELECT COUNT(*) FROM memo").fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM memo WHERE key IN (SELECT key FROM memo ORDER BY last_access LIMIT ?)",
+                (count - self.max_entries,),
+            )
+    
+    def clear(self, prefix=None):
+        """Delete every stored result, or only the keys starting with prefix."""
+        conn = self._connection()
+        if prefix is None:
+            conn.execute("DELETE FROM memo")
+            return
+        # Keys with the prefix form one range of the primary key index:
+        # prefix <= key < prefix with its last byte incremented
+        upper = prefix.rstrip(b"\xff")
+        if not upper:
+            conn.execute("DELETE FROM memo WHERE key >= ?", (prefix,))
+            return
+        upper = upper[:-1] + bytes([upper[-1] + 1])
+        conn.execute("DELETE FROM memo WHERE key >= ? AND key < ?", (prefix, upper))
+    
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM memo").fetchone()[0]
+
+def cache_result(func=None, *, maxsize=None, ttl=None, max_bytes=None, sizer=None, backend=None):
+    """Decorator to cache function results.
+
+    Use as ``@cache_result`` or ``@cache_result(maxsize=..., ttl=...,
+    max_bytes=...)``. Keys are hashable tuples of the arguments (lists,
+    dicts and sets are frozen first; calls with other unhashable arguments,
+    such as NumPy arrays, are not cached). Least recently used results are
+    dropped once ``maxsize`` entries or ``max_bytes`` (measured with
+    ``sizer``, deep_getsizeof by default) are exceeded, and entries older
+    than ``ttl`` seconds are recomputed. ``wrapper.cache_info()`` reports
+    counters and ``wrapper.cache_clear()`` empties the cache.
+
+    With ``backend`` (e.g. SQLiteCacheBackend) misses in the in-memory
+    cache are looked up in the shared store before calling the function,
+    and new results are written through to it. Calls whose key has no
+    canonical encoding (e.g. a lock argument) use the in-memory cache only.
+
+    Coroutine functions get an async wrapper that caches the awaited
+    result. Concurrent misses for the same key share one underlying call
+    ("single flight") instead of each hitting the upstream; failures are
+    propagated to every waiter and not cached. Their backend reads and
+    writes run in a worker thread so a busy store doesn't stall the loop.
+    """
+    if func is None:
+        return lambda f: cache_result(f, maxsize=maxsize, ttl=ttl, max_bytes=max_bytes,
+                                      sizer=sizer, backend=backend)
+    
+    import time
+    import inspect
+    from functools import wraps
+    
+    measure = sizer or deep_getsizeof
+    cache = OrderedDict()  # key -> (result, expires_at)
+    sizes = {}
+    info = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "uncacheable": 0, "bytes": 0}
+    if backend is not None:
+        info["backend_hits"] = 0
+        namespace = f"{func.__module__}.{func.__qualname__}".encode() + b"\0"
+    
+    def evict_oldest():
+        old_key, _ = cache.popitem(last=False)
+        if max_bytes is not None:
+            info["bytes"] -= sizes.pop(old_key)
+        info["evictions"] += 1
+    
+    def lookup(args, kwargs):
+        """Return ``(key, found, result)``; key is None if the arguments can't be cached."""
+        key = make_cache_key(args, kwargs)
+        try:
+            entry = cache.get(key)
+        except TypeError:
+            # Unhashable arguments (lists, dicts, ...): freeze them first
+            try:
+                key = _freeze(key)
+            except TypeError:
+                info["uncacheable"] += 1
+                return None, False, None
+            entry = cache.get(key)
         
+        if entry is not None:
+            if ttl is None or entry[1] > time.monotonic():
+                info["hits"] += 1
+                cache.move_to_end(key)
+                return key, True, entry[0]
+            # Expired: drop it and recompute
+            del cache[key]
+            if max_bytes is not None:
+                info["bytes"] -= sizes.pop(key)
+            info["expired"] += 1
+        return key, False, None
+    
+    def backend_key(key):
+        """Canonical bytes for the shared store, or None if the key can't be encoded."""
+        try:
+            return namespace + _encode_key(key)
+        except (TypeError, AttributeError, pickle.PicklingError):
+            return None
+    
+    def store(key, result):
+        expires_at = time.monotonic() + ttl if ttl is not None else None
         if key in cache:
-            print(f"Cache hit for {func.__name__}")
-            return cache[key]
+            # Stored again by a reentrant or racing call: replace, don't double count
+            cache.move_to_end(key)
+        cache[key] = (result, expires_at)
+        if max_bytes is not None:
+            size = measure(result)
+            info["bytes"] += size - sizes.get(key, 0)
+            sizes[key] = size
+            while info["bytes"] > max_bytes and cache:
+                evict_oldest()
+        if maxsize is not None:
+            while len(cache) > maxsize:
+                evict_oldest()
+    
+    if inspect.iscoroutinefunction(func):
+        import asyncio
+        in_flight = {}  # key -> task running the single shared call
+        info["coalesced"] = 0
         
-        print(f"Cache miss for {func.__name__}")
-        result = func(*args, **kwargs)
-        cache[key] = result
-        return result
+        async def compute(key, args, kwargs):
+            shared_key = backend_key(key) if backend is not None else None
+            if shared_key is not None:
+                # Backend calls block (sqlite waits on locked writers), so keep them off the loop
+                found, result = await asyncio.to_thread(backend.get, shared_key)
+                if found:
+                    info["backend_hits"] += 1
+                    store(key, result)
+                    return result
+            info["misses"] += 1
+            result = await func(*args, **kwargs)
+            if shared_key is not None:
+                await asyncio.to_thread(backend.set, shared_key, result, ttl)
+            store(key, result)
+            return result
+        
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key, found, result = lookup(args, kwargs)
+            if found:
+                return result
+            if key is None:
+                return await func(*args, **kwargs)
+            task = in_flight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(compute(key, args, kwargs))
+                in_flight[key] = task
+                task.add_done_callback(lambda _, key=key: in_flight.pop(key, None))
+            else:
+                # Single flight: wait for the call already in progress
+                info["coalesced"] += 1
+            # shield() keeps one cancelled caller from cancelling the others
+            return await asyncio.shield(task)
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key, found, result = lookup(args, kwargs)
+            if found:
+                return result
+            if key is None:
+                return func(*args, **kwargs)
+            
+            shared_key = backend_key(key) if backend is not None else None
+            if shared_key is not None:
+                found, result = backend.get(shared_key)
+                if found:
+                    info["backend_hits"] += 1
+                    store(key, result)
+                    return result
+            info["misses"] += 1
+            result = func(*args, **kwargs)
+            if shared_key is not None:
+                backend.set(shared_key, result, ttl)
+            store(key, result)
+            return result
     
+    def cache_info():
+        """Return hit/miss/eviction counters, entry count and resident bytes."""
+        return dict(info, size=len(cache), maxsize=maxsize, ttl=ttl, max_bytes=max_bytes)
+    
+    def cache_clear():
+        """Remove every cached result of this function (including its backend rows) and reset the counters."""
+        cache.clear()
+        sizes.clear()
+        if backend is not None:
+            backend.clear(namespace)
+        for name in info:
+            info[name] = 0
+    
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
     return wrapper
 
 @cache_result
@@ -48,6 +403,76 @@ def expensive_calculation(n):
 
 print(f"First call: {expensive_calculation(5)}")
 print(f"Second call: {expensive_calculation(5)}")  # Should use cache
+print(f"Cache info: {expensive_calculation.cache_info()}")
+
+@cache_result(maxsize=128, ttl=60)
+def lookup_tags(tags, limit=10):
+    """Unhashable arguments like lists still produce a cache key."""
+    return sorted(tags)[:limit]
+
+lookup_tags(["b", "a"], limit=5)
+lookup_tags(["b", "a"], limit=5)
+print(f"Bounded TTL cache info: {lookup_tags.cache_info()}")
+
+@cache_result(max_bytes=2048)
+def build_table(n):
+    """Build a list whose memory grows with n."""
+    return list(range(n))
+
+build_table(10)
+build_table(50)  # Together with the first result this exceeds the budget
+print(f"Byte-budget cache info: {build_table.cache_info()}")
+
+@cache_result(ttl=30)
+async def fetch_profile(user_id):
+    """Simulate a slow upstream fetch."""
+    import asyncio
+    await asyncio.sleep(0.05)
+    return {"id": user_id}
+
+async def run_single_flight_example():
+    """Ten concurrent misses for one key trigger a single upstream call."""
+    import asyncio
+    results = await asyncio.gather(*(fetch_profile(7) for _ in range(10)))
+    print(f"Single-flight results: {len(results)} x {results[0]}")
+    print(f"Async cache info: {fetch_profile.cache_info()}")
+
+import asyncio
+asyncio.run(run_single_flight_example())
+
+def benchmark_memoize_backends(calls=2_000, work_seconds=0.001):
+    """Compare cold, warm-in-memory and warm-on-disk memoized call latency.
+
+    "Warm on disk" uses a fresh decorator sharing the SQLite file, which is
+    what a restarted worker (or a sibling process) sees.
+    """
+    import os
+    import tempfile
+    import time
+    
+    def slow_square(n):
+        time.sleep(work_seconds)
+        return n * n
+    
+    def time_calls(memoized):
+        start = time.perf_counter()
+        for n in range(calls):
+            memoized(n)
+        return (time.perf_counter() - start) / calls * 1e6
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteCacheBackend(os.path.join(tmp, "memo.sqlite3"), max_entries=calls * 2)
+        memoized = cache_result(slow_square, backend=backend)
+        results = {
+            "cold": time_calls(memoized),
+            "warm_memory": time_calls(memoized),
+            "warm_disk": time_calls(cache_result(slow_square, backend=backend)),
+        }
+    for name, micros in results.items():
+        print(f"{name:>12}: {micros:8.1f} us/call")
+    return results
+
+benchmark_memoize_backends(calls=200)
 
 # Rate limiting decorator
 def rate_limit(calls_per_second):